@@ -0,0 +1,64 @@
+# kernel.py – Umbra Blind Energy Model: compiled kernels for parameter sweeps
+# -----------------------------------------------------------------------------
+# JIT-compiles the physics in model.py (motor_kwh_array, thermal_kwh) so sweep
+# loops run natively; there is no second copy of the formulas here. Model
+# constants are passed in as arguments rather than read as globals, so the
+# numba disk cache cannot serve results for stale constants.
+# numba is optional: without it the kernels run as ordinary Python/NumPy.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba not installed – run uncompiled
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+    prange = range
+
+import model
+
+GHI_ARR = np.asarray(model.GHI, dtype=np.float64)
+HDD_ARR = np.asarray(model.HDD, dtype=np.float64)
+
+# Scalar calls; pass calendar_days / annual_ghi / hdd_kkh explicitly.
+motor_kwh = njit(cache=True, fastmath=True)(model.motor_kwh_array)
+thermal_kwh = njit(cache=True, fastmath=True)(model.thermal_kwh)
+
+@njit(cache=True, fastmath=True, parallel=True)
+def motor_kwh_batch(active_w, standby_w, usage, moves, operating_days, n, calendar_days):
+    """motor_kwh() over equal-length 1-D float64 arrays, one scenario per element."""
+    out = np.empty(active_w.shape[0])
+    for k in prange(active_w.shape[0]):
+        out[k] = motor_kwh(active_w[k], standby_w[k], usage[k], moves[k],
+                           operating_days[k], n[k], calendar_days)
+    return out
+
+@njit(cache=True, fastmath=True)
+def compute_kernel(area, usage_old, usage_new, shgc_bare, shgc_new, aperture,
+                   u_glass, delta_u_old, delta_u_new, cop, is_kindow_reflective,
+                   motor_old, motor_new, standby, moves_day, days, n_blinds,
+                   ghi_arr, hdd_arr, shgc_old, calendar_days):
+    """
+    Existing vs new thermal and motor kWh/yr for one scenario:
+    (cool_old, cool_new, heat_old, heat_new, motor_old, motor_new).
+    ghi_arr / hdd_arr are the monthly float64 tables (GHI_ARR, HDD_ARR);
+    shgc_old / calendar_days are model.SHGC_OLD / model.CALENDAR_DAYS.
+    """
+    annual_ghi = 0.0
+    hdd_kkh = 0.0
+    for m in range(ghi_arr.shape[0]):
+        annual_ghi += ghi_arr[m]
+        hdd_kkh += hdd_arr[m]
+    hdd_kkh *= 24 / 1000.0
+
+    cool_old, heat_old = thermal_kwh(usage_old, shgc_old, delta_u_old, shgc_bare, aperture,
+                                     u_glass, cop, area, False, annual_ghi, hdd_kkh)
+    cool_new, heat_new = thermal_kwh(usage_new, shgc_new, delta_u_new, shgc_bare, aperture,
+                                     u_glass, cop, area, is_kindow_reflective,
+                                     annual_ghi, hdd_kkh)
+    return (cool_old, cool_new, heat_old, heat_new,
+            motor_kwh(motor_old, standby, usage_old, moves_day, days, n_blinds, calendar_days),
+            motor_kwh(motor_new, standby, usage_new, moves_day, days, n_blinds, calendar_days))
@@ -0,0 +1,280 @@
+# model.py – Umbra Blind Energy Model: constants and whole-year calculation
+# -----------------------------------------------------------------------------
+# Pure calculation behind app.py: NumPy only, no Streamlit, so sweep scripts and
+# kernel.py can import it directly. Imported once per process, so module-level
+# constants are built once rather than on every Streamlit rerun.
+# -----------------------------------------------------------------------------
+
+import math
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+
+# ───────────────────── Climate Data (simplified) ─────────────────────
+# Immutable float tuples (monthly source data; only the annual totals below are used).
+MONTHS = ("Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec")
+GHI: tuple[float, ...] = (24.0,43.0,75.0,105.0,132.0,140.0,145.0,135.0,100.0,64.0,35.0,23.0)    # kWh/m²·mo (global horizontal, TMY)
+HDD: tuple[float, ...] = (300.0,255.0,205.0,115.0,55.0,18.0,11.0,25.0,80.0,165.0,240.0,290.0)  # °C·d / mo (base 18 °C, TMY)
+
+# Every factor applied to GHI/HDD is scalar, so the model only needs annual totals;
+# the monthly tables above are kept as the documented source.
+ANNUAL_GHI: Final = math.fsum(GHI)             # 1021 kWh/m²·yr
+ANNUAL_HDD_HOURS: Final = math.fsum(HDD) * 24  # 42216 °C·h / yr
+HDD_KKH: Final = ANNUAL_HDD_HOURS / 1000.0     # heating kWh per W/K of fabric loss
+
+# ───────────────────── Defaults & Constants ─────────────────────
+@dataclass(frozen=True, slots=True)
+class Defaults:
+    """Initial sidebar values."""
+    area: int = 44_800
+    motor_old: int = 120
+    motor_new: int = 10
+    standby: float = 0.5
+    moves: int = 6
+    blinds: int = 1000
+    days: int = 260                      # operating days (lighting + active motor)
+    usage_old: float = 0.80
+    usage_new: float = 1.00
+    u_glass: float = 1.2
+    delta_u_old: float = 0.15
+    cop: float = 3.0
+    c_ele: float = 0.20
+    c_heat: float = 0.10
+    shgc_bare: float = 0.62              # typical double glazing SHGC (user-adjustable below)
+    aperture: float = 1.00               # solar aperture factor (orientation/obstructions)
+    lpd: float = 8.0
+    hours_day: float = 10.0
+
+DEFAULT = Defaults()
+
+SHGC_OLD: Final = 0.45  # Existing “with blind down” SHGC (Hexel Screen Vision 5 %)
+# New fabrics: (name, SHGC when down, ΔU when fully closed, reflective for TU/e Kindow effects).
+# ΔU is applied as a linear blend by usage. Stored column-wise so lookups are array indexes.
+FABRICS = [
+    ("Umbra Alu-Back Screen",   0.27, 0.20, True),
+    ("Umbra White-Back Screen", 0.34, 0.15, True),
+    ("Umbra Standard Screen",   0.45, 0.10, False),
+]
+_names, _shgc, _delta_u, _reflective = zip(*FABRICS)
+FABRIC_NAMES = _names
+SHGC_NEW = np.array(_shgc, dtype=np.float64)
+DELTA_U_NEW = np.array(_delta_u, dtype=np.float64)
+IS_REFLECTIVE = np.array(_reflective, dtype=bool)
+for _a in (SHGC_NEW, DELTA_U_NEW, IS_REFLECTIVE):
+    _a.flags.writeable = False  # shared across sessions
+FABRIC_OPTIONS = tuple(range(len(FABRICS)))  # selectbox values are indexes into the arrays
+
+ELEC_CO2: Final = 0.233  # kg CO₂/kWh (electricity)
+HEAT_CO2: Final = 0.184  # kg CO₂/kWh (heating energy)
+TREE_CO2: Final = 22     # kg CO₂ / tree·yr
+FLIGHT_CO2: Final = 1.6  # t CO₂ / London-NYC rtn flight
+CALENDAR_DAYS: Final = 365  # standby present all year
+
+# ───────────────────── Calculation ─────────────────────
+def motor_kwh_array(active_w, standby_w, usage, moves, operating_days, n,
+                    calendar_days=CALENDAR_DAYS):
+    """
+    Annual motor energy (kWh), broadcast over any mix of scalars and arrays:
+      • Active: movements scale with usage (fewer moves if blinds seldom used)
+      • Standby: present for calendar_days regardless of usage
+    Uses only ufuncs and arithmetic so kernel.py can JIT-compile it unchanged.
+    """
+    active_h_per_day = moves * np.minimum(np.maximum(usage, 0.0), 1.0) * 0.01  # 1 cycle ≈ 36 s
+    standby_h_per_day = np.maximum(0.0, 24 - active_h_per_day)
+    kwh = (
+        active_w * active_h_per_day * operating_days
+        + standby_w * standby_h_per_day * calendar_days
+    ) / 1000.0
+    return kwh * n
+
+def lighting_adjustment(is_reflective, is_kindow):
+    """
+    Fractional multiplier for lighting energy (element-wise over arrays):
+      • Reflective vs non-reflective under baseline control: ~0.94×
+      • Kindow (with reflective fabric): ~0.60× vs baseline reflective
+      • If Kindow selected without reflective fabric, fall back to modest benefit (0.85×) or warn.
+    """
+    return np.where(
+        is_kindow,
+        np.where(is_reflective, 0.60, 0.85),  # 0.85: conservative fallback for Kindow + non-reflective
+        np.where(is_reflective, 0.94, 1.00),
+    )
+
+def _rows(existing, new):
+    """Row 0 is the existing system; rows 1.. are the new system with each of FABRICS."""
+    return np.r_[existing, np.broadcast_to(new, len(FABRICS))]
+
+# Existing blinds are non-reflective on baseline control.
+REFLECTIVE_ROWS = _rows(False, IS_REFLECTIVE)
+
+def _motors(motor_old, motor_new, standby, usage_old, usage_new, moves_day, days, n_blinds):
+    """Motor kWh/yr as [existing, new] (fabric-independent)."""
+    return motor_kwh_array(np.array([motor_old, motor_new]), standby,
+                           np.array([usage_old, usage_new]), moves_day, days, n_blinds)
+
+def thermal_kwh(usage, shgc_down, delta_u, shgc_bare, aperture, u_glass, cop, area,
+                kindow_reflective=False, annual_ghi=ANNUAL_GHI, hdd_kkh=HDD_KKH):
+    """
+    Cooling electricity and heating kWh/yr, broadcast over any mix of scalars and
+    arrays (shgc_down / delta_u are the blind-down SHGC and ΔU of the fabric).
+    Uses only ufuncs and arithmetic so kernel.py can JIT-compile it unchanged.
+    """
+    # Effective SHGC blends between bare-glass SHGC and blind-down SHGC by usage.
+    SHGC_eff = (1 - usage) * shgc_bare + usage * shgc_down
+
+    # Cooling electricity (kWh): solar heat gain SHGC × GHI × Area × Aperture, divided by COP
+    # (COP ≥ 1 is the caller's contract; the sidebar input enforces it via min_value)
+    cool = SHGC_eff * annual_ghi * area * aperture / cop
+
+    # Transmission heating (kWh): U_eff * A * HDD * 24 / 1000
+    U_floor = 0.20  # floor to avoid non-physical U
+    U_eff = np.maximum(U_floor, u_glass - usage * delta_u)
+    heat = U_eff * area * hdd_kkh
+
+    # TU/e control multipliers on NEW thermal, only when Kindow + reflective fabric
+    cool = cool * (1.0 + 0.25 * kindow_reflective)  # ×1.25: more daylight/view time → slightly higher cooling
+    heat = heat * (1.0 - 0.25 * kindow_reflective)  # ×0.75: more open time but reflective when closed → lower heating
+    return cool, heat
+
+def compute_savings_vec(usage_old, usage_new, shgc_new, delta_u_new, *, area, shgc_bare,
+                        aperture, u_glass, delta_u_old, cop, c_ele, c_heat,
+                        kindow_reflective=False):
+    """
+    Thermal savings for a parameter sweep, e.g. an SHGC × usage grid built with
+    np.meshgrid. All arguments broadcast; returns (cooling kWh saved,
+    heating kWh saved, £ saved) with the broadcast shape.
+    """
+    cool_old, heat_old = thermal_kwh(usage_old, SHGC_OLD, delta_u_old, shgc_bare,
+                                     aperture, u_glass, cop, area)
+    cool_new, heat_new = thermal_kwh(usage_new, shgc_new, delta_u_new, shgc_bare,
+                                     aperture, u_glass, cop, area, kindow_reflective)
+    d_cool, d_heat = cool_old - cool_new, heat_old - heat_new
+    return d_cool, d_heat, d_cool * c_ele + d_heat * c_heat
+
+def _thermal(area, usage_old, usage_new, shgc_bare, aperture, u_glass, delta_u_old, cop, is_kindow):
+    """Cooling electricity and heating kWh/yr per row (see _rows)."""
+    return thermal_kwh(
+        _rows(usage_old, usage_new), _rows(SHGC_OLD, SHGC_NEW), _rows(delta_u_old, DELTA_U_NEW),
+        shgc_bare, aperture, u_glass, cop, area,
+        kindow_reflective=_rows(False, is_kindow) & REFLECTIVE_ROWS,
+    )
+
+def _lighting(lpd, area, hours_day, days, is_kindow):
+    """Lighting kWh/yr per row (see _rows), with TU/e multipliers."""
+    # Baseline lighting demand without daylight control effects
+    lit_base_kwh = lpd * area * (hours_day * days) / 1000.0  # kWh/yr
+    return lit_base_kwh * lighting_adjustment(REFLECTIVE_ROWS, _rows(False, is_kindow))
+
+@dataclass(frozen=True)
+class Results:
+    """compute() output: annual kWh/£ as existing (*_old) vs new (*_new), plus per-fabric rows."""
+    motor_old_kwh: float
+    motor_new_kwh: float
+    cool_old: float
+    cool_new: float
+    heat_old: float
+    heat_new: float
+    lighting_old_kwh: float
+    lighting_new_kwh: float
+    cost_motor_old: float
+    cost_motor_new: float
+    cost_cool_old: float
+    cost_cool_new: float
+    cost_heat_old: float
+    cost_heat_new: float
+    cost_light_old: float
+    cost_light_new: float
+    elec_old: float
+    elec_new: float
+    energy_saved: float
+    cost_saved: float
+    co2_total_kg: float
+    fab_cool: tuple
+    fab_heat: tuple
+    fab_light: tuple
+    fab_cost_saved: tuple
+    fab_co2_saved_t: tuple
+
+@dataclass(frozen=True)
+class ModelInputs:
+    """Sidebar inputs for one scenario; see Defaults for typical values."""
+    area: float
+    usage_old: float
+    usage_new: float
+    motor_old: float
+    motor_new: float
+    standby: float
+    moves_day: float
+    n_blinds: int
+    fabric_idx: int          # index into FABRICS
+    shgc_bare: float
+    aperture: float
+    u_glass: float
+    delta_u_old: float
+    cop: float
+    c_ele: float
+    c_heat: float
+    strategy: str            # "Baseline ..." or "Kindow ..."
+    days: int
+    hours_day: float
+    lpd: float
+
+    @property
+    def is_kindow(self) -> bool:
+        return self.strategy.startswith("Kindow")
+
+def compute(i: ModelInputs) -> Results:
+    """
+    Whole-year energy, cost and CO₂ for existing vs new blinds.
+    Combines the motor/thermal/lighting stages with tariffs and carbon
+    factors. New-system terms cover every fabric; the selected one is returned
+    as floats and the full set as ``fab_*`` tuples for the comparison table.
+    """
+    c_ele, c_heat = i.c_ele, i.c_heat
+    motor = _motors(i.motor_old, i.motor_new, i.standby, i.usage_old, i.usage_new,
+                    i.moves_day, i.days, i.n_blinds)
+    cool, heat = _thermal(i.area, i.usage_old, i.usage_new, i.shgc_bare, i.aperture,
+                          i.u_glass, i.delta_u_old, i.cop, i.is_kindow)
+    lighting = _lighting(i.lpd, i.area, i.hours_day, i.days, i.is_kindow)
+
+    # ── Fabric comparison (savings vs existing for every fabric) ──
+    elec = _rows(motor[0], motor[1]) + cool + lighting
+    cool_fab, heat_fab, lighting_fab = cool[1:], heat[1:], lighting[1:]
+    d_elec = elec[0] - elec[1:]
+    d_heat = heat[0] - heat_fab
+    fab_cost_saved = d_elec * c_ele + d_heat * c_heat
+    fab_co2_saved_t = (d_elec * ELEC_CO2 + d_heat * HEAT_CO2) / 1000.0
+
+    # ── Existing vs selected fabric: [old, new] ──
+    sel = [0, 1 + i.fabric_idx]
+    cool, heat, lighting, elec = cool[sel], heat[sel], lighting[sel], elec[sel]
+
+    # ── Costs ──
+    cost_motor = motor    * c_ele
+    cost_cool  = cool     * c_ele
+    cost_heat  = heat     * c_heat
+    cost_light = lighting * c_ele
+
+    # ── Totals (site energy) & Carbon: one delta per energy type ──
+    d_elec_sel, d_heat_sel = elec[0] - elec[1], heat[0] - heat[1]
+    energy_saved = d_elec_sel + d_heat_sel
+    cost_saved = d_elec_sel * c_ele + d_heat_sel * c_heat
+    co2_total_kg = d_elec_sel * ELEC_CO2 + d_heat_sel * HEAT_CO2
+
+    return Results(
+        motor_old_kwh=float(motor[0]), motor_new_kwh=float(motor[1]),
+        cool_old=float(cool[0]), cool_new=float(cool[1]),
+        heat_old=float(heat[0]), heat_new=float(heat[1]),
+        lighting_old_kwh=float(lighting[0]), lighting_new_kwh=float(lighting[1]),
+        cost_motor_old=float(cost_motor[0]), cost_motor_new=float(cost_motor[1]),
+        cost_cool_old=float(cost_cool[0]), cost_cool_new=float(cost_cool[1]),
+        cost_heat_old=float(cost_heat[0]), cost_heat_new=float(cost_heat[1]),
+        cost_light_old=float(cost_light[0]), cost_light_new=float(cost_light[1]),
+        elec_old=float(elec[0]), elec_new=float(elec[1]),
+        energy_saved=float(energy_saved), cost_saved=float(cost_saved),
+        co2_total_kg=float(co2_total_kg),
+        fab_cool=tuple(cool_fab.tolist()), fab_heat=tuple(heat_fab.tolist()),
+        fab_light=tuple(lighting_fab.tolist()), fab_cost_saved=tuple(fab_cost_saved.tolist()),
+        fab_co2_saved_t=tuple(fab_co2_saved_t.tolist()),
+    )
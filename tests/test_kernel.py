@@ -0,0 +1,95 @@
+"""Parity of the (optionally numba-compiled) kernels with the NumPy model."""
+
+import numpy as np
+import pytest
+
+import kernel
+import model
+
+N = 2000
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(0)
+    return dict(
+        area=rng.uniform(100, 50_000, N),
+        usage_old=rng.uniform(-0.2, 1.2, N),
+        usage_new=rng.uniform(-0.2, 1.2, N),
+        shgc_bare=rng.uniform(0.2, 0.9, N),
+        fabric=rng.integers(0, len(model.FABRICS), N),
+        aperture=rng.uniform(0.1, 1.2, N),
+        u_glass=rng.uniform(0.2, 6.0, N),
+        delta_u_old=rng.uniform(0.0, 1.0, N),
+        cop=rng.uniform(1.0, 10.0, N),
+        kindow=rng.integers(0, 2, N).astype(bool),
+        motor_old=rng.uniform(1, 500, N),
+        motor_new=rng.uniform(1, 500, N),
+        standby=rng.uniform(0.0, 5.0, N),
+        moves=rng.uniform(0, 40, N),
+        days=rng.uniform(200, 365, N),
+        n=rng.uniform(1, 20_000, N),
+    )
+
+
+def test_compute_kernel_matches_model(inputs):
+    x = inputs
+    shgc_new = model.SHGC_NEW[x["fabric"]]
+    delta_u_new = model.DELTA_U_NEW[x["fabric"]]
+    kr = x["kindow"] & model.IS_REFLECTIVE[x["fabric"]]
+
+    got = np.array([
+        kernel.compute_kernel(
+            x["area"][k], x["usage_old"][k], x["usage_new"][k], x["shgc_bare"][k],
+            shgc_new[k], x["aperture"][k], x["u_glass"][k], x["delta_u_old"][k],
+            delta_u_new[k], x["cop"][k], bool(kr[k]), x["motor_old"][k],
+            x["motor_new"][k], x["standby"][k], x["moves"][k], x["days"][k], x["n"][k],
+            kernel.GHI_ARR, kernel.HDD_ARR, model.SHGC_OLD, model.CALENDAR_DAYS,
+        )
+        for k in range(N)
+    ]).T
+
+    cool_old, heat_old = model.thermal_kwh(
+        x["usage_old"], model.SHGC_OLD, x["delta_u_old"], x["shgc_bare"],
+        x["aperture"], x["u_glass"], x["cop"], x["area"])
+    cool_new, heat_new = model.thermal_kwh(
+        x["usage_new"], shgc_new, delta_u_new, x["shgc_bare"],
+        x["aperture"], x["u_glass"], x["cop"], x["area"], kr)
+    motor_old = model.motor_kwh_array(x["motor_old"], x["standby"], x["usage_old"],
+                                      x["moves"], x["days"], x["n"])
+    motor_new = model.motor_kwh_array(x["motor_new"], x["standby"], x["usage_new"],
+                                      x["moves"], x["days"], x["n"])
+
+    expected = np.array([cool_old, cool_new, heat_old, heat_new, motor_old, motor_new])
+    np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+
+def test_motor_kwh_batch_matches_model(inputs):
+    x = inputs
+    args = (x["motor_old"], x["standby"], x["usage_old"], x["moves"], x["days"], x["n"])
+    np.testing.assert_allclose(
+        kernel.motor_kwh_batch(*args, model.CALENDAR_DAYS),
+        model.motor_kwh_array(*args),
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("kindow_reflective", [False, True])
+def test_compute_savings_vec_matches_thermal_kwh(kindow_reflective):
+    params = dict(area=44_800, shgc_bare=0.62, aperture=1.0, u_glass=1.2, cop=3.0)
+    delta_u_old, delta_u_new, c_ele, c_heat = 0.15, 0.2, 0.20, 0.10
+    usage_new, shgc_new = np.meshgrid(np.linspace(0.0, 1.0, 5), np.linspace(0.2, 0.5, 4))
+
+    d_cool, d_heat, cost = model.compute_savings_vec(
+        0.8, usage_new, shgc_new, delta_u_new, delta_u_old=delta_u_old,
+        c_ele=c_ele, c_heat=c_heat, kindow_reflective=kindow_reflective, **params)
+
+    cool_old, heat_old = model.thermal_kwh(0.8, model.SHGC_OLD, delta_u_old, **params)
+    for idx in np.ndindex(usage_new.shape):
+        cool_new, heat_new = model.thermal_kwh(
+            usage_new[idx], shgc_new[idx], delta_u_new,
+            kindow_reflective=kindow_reflective, **params)
+        assert d_cool[idx] == pytest.approx(cool_old - cool_new, rel=1e-12)
+        assert d_heat[idx] == pytest.approx(heat_old - heat_new, rel=1e-12)
+        assert cost[idx] == pytest.approx(
+            (cool_old - cool_new) * c_ele + (heat_old - heat_new) * c_heat, rel=1e-12)